@@ -1,4 +1,9 @@
 from .anndata_preprocess import anndata_preprocess
-from .dataset_acquisition import abstract_anndata, abstract_models, sample_dataset
+from .dataset_acquisition import (
+    abstract_anndata,
+    abstract_models,
+    anndata_file,
+    sample_dataset,
+)
 from .dataset_manager import local_dataset_manager
 from .image_manager import icon_manager
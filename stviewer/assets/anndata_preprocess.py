@@ -1,30 +1,55 @@
 from typing import Optional
 
 import anndata as ad
+import h5py
 from scipy.sparse import csr_matrix, issparse
 
 
+def _write_chunked_csr(
+    f: h5py.File,
+    key: str,
+    matrix,
+    compression: Optional[str] = "lzf",
+    chunk_bytes: int = 256 * 1024,
+):
+    """Write a sparse matrix in anndata's csr_matrix encoding, with ~``chunk_bytes`` chunks for each buffer."""
+    matrix = matrix.tocsr()
+    group = f.require_group(key)
+    group.attrs["encoding-type"] = "csr_matrix"
+    group.attrs["encoding-version"] = "0.1.0"
+    group.attrs["shape"] = matrix.shape
+    for name in ["data", "indices", "indptr"]:
+        array = getattr(matrix, name)
+        chunks = (
+            (max(1, min(array.shape[0], chunk_bytes // array.itemsize)),)
+            if array.shape[0] > 0
+            else None
+        )
+        group.create_dataset(
+            name,
+            data=array,
+            chunks=chunks,
+            compression=None if chunks is None else compression,
+        )
+
+
 def anndata_preprocess(
     path: str,
     output_path: str,
     X_counts: str = "X_counts",
     X_log1p: Optional[str] = "X_log1p",
     spatial_key: str = "3d_align_spatial",
+    compression: Optional[str] = "lzf",
 ):
     adata = ad.read_h5ad(filename=path)
 
     # matrices
-    X_counts = (
-        adata.layers[X_counts].copy()
-        if issparse(adata.layers[X_counts])
-        else csr_matrix(adata.layers[X_counts])
-    )
+    # The original layers are released by `del adata.layers` below, so no copy is needed.
+    X_counts = adata.layers[X_counts]
+    X_counts = X_counts if issparse(X_counts) else csr_matrix(X_counts, copy=False)
     if not (X_log1p is None):
-        X_log1p = (
-            adata.layers[X_log1p].copy()
-            if issparse(adata.layers[X_log1p])
-            else csr_matrix(adata.layers[X_log1p])
-        )
+        X_log1p = adata.layers[X_log1p]
+        X_log1p = X_log1p if issparse(X_log1p) else csr_matrix(X_log1p, copy=False)
     else:
         import dynamo as dyn
 
@@ -39,11 +64,18 @@ def anndata_preprocess(
 
     # preprocess
     del adata.uns, adata.layers, adata.obsm, adata.obsp, adata.varm
-    adata.X = X_counts
-    adata.layers["X_log1p"] = X_log1p
+    adata.X = None
     adata.obsm["spatial"] = spatial_coords
 
-    adata.write_h5ad(output_path, compression="gzip")
+    # The matrices are written separately so that their buffers get explicit chunk shapes
+    # instead of h5py's auto-chunking, keeping a cell-at-a-time read within a few chunks.
+    adata.write_h5ad(output_path, compression=compression)
+    with h5py.File(output_path, "a") as f:
+        _write_chunked_csr(f, "X", X_counts, compression=compression)
+        _write_chunked_csr(f, "layers/X_log1p", X_log1p, compression=compression)
+
+    adata.X = X_counts
+    adata.layers["X_log1p"] = X_log1p
     return adata
 
 
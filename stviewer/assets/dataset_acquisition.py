@@ -20,6 +20,16 @@ def abstract_anndata(path: str, X_layer: str = "X"):
     return adata
 
 
+def anndata_file(path: str) -> str:
+    """Return the path of the anndata file under the ``h5ad`` directory of the dataset ``path``."""
+    anndata_dir = os.path.join(path, "h5ad")
+    with os.scandir(anndata_dir) as entries:
+        entry = next(entries, None)
+    if entry is None:
+        raise FileNotFoundError(f"There is no anndata file under `{anndata_dir}`.")
+    return entry.path
+
+
 def abstract_models(path: str, model_ids: Optional[list] = None):
     model_files = os.listdir(path=path)
     model_files.sort()
@@ -42,11 +52,7 @@ def sample_dataset(
     mesh_model_ids: Optional[list] = None,
 ):
     # Generate anndata object
-    anndata_path = os.path.join(path, "h5ad")
-    adata = abstract_anndata(
-        path=os.path.join(anndata_path, os.listdir(path=anndata_path)[0]),
-        X_layer=X_layer,
-    )
+    adata = abstract_anndata(path=anndata_file(path=path), X_layer=X_layer)
 
     # Generate point cloud models
     pc_models_path = os.path.join(path, "pc_models")
@@ -1,4 +1,4 @@
-import base64
+import binascii
 from pathlib import Path
 
 from trame.app.mimetypes import to_mime
@@ -15,8 +15,12 @@ def to_base64(file_path):
         File content encoded in base64
 
     """
+    # Chunk size is a multiple of 3 so no padding appears mid-stream.
+    encoded = bytearray()
     with open(file_path, "rb") as bin_file:
-        return base64.b64encode(bin_file.read()).decode("ascii")
+        for chunk in iter(lambda: bin_file.read(57 * 1024), b""):
+            encoded += binascii.b2a_base64(chunk, newline=False)
+    return encoded.decode("ascii")
 
 
 def to_url(file_path: str):
@@ -50,6 +54,7 @@ class LocalFileManager:
 
         self._root = Path(str(_base.resolve().absolute()))
         self._assests = {}
+        self._path_cache = {}
 
     def __getitem__(self, name):
         return self._assests.get(name)
@@ -58,11 +63,17 @@ class LocalFileManager:
         return self._assests.get(name)
 
     def _to_path(self, file_path):
+        if file_path in self._path_cache:
+            return self._path_cache[file_path]
+
         _input_file = Path(file_path)
         if _input_file.is_absolute():
-            return str(_input_file.resolve().absolute())
+            _path = str(_input_file.resolve().absolute())
+        else:
+            _path = str(self._root.joinpath(file_path).resolve().absolute())
 
-        return str(self._root.joinpath(file_path).resolve().absolute())
+        self._path_cache[file_path] = _path
+        return _path
 
     def file_url(self, key: str, file_path: str):
         """
@@ -1,4 +1,3 @@
-from .pv_alignment import morpho_align, paste_align
 from .pv_callback import Viewer
 from .pv_models import init_models
 from .pv_plotter import add_single_model, create_plotter
@@ -1,5 +1,5 @@
-import os
 import warnings
+from itertools import chain
 
 warnings.filterwarnings("ignore")
 
@@ -12,7 +12,7 @@ except ImportError:
 
 from typing import Optional
 
-from stviewer.assets import sample_dataset
+from stviewer.assets import anndata_file, sample_dataset
 
 
 def generate_actors(
@@ -22,49 +22,58 @@ def generate_actors(
     pc_model_names: Optional[list] = None,
     mesh_model_names: Optional[list] = None,
 ):
-    # Generate actors for pc models
-    pc_kwargs = dict(model_style="points", model_size=8)
-    if not (pc_models is None):
-        pc_actors = [
-            add_single_model(
-                plotter=plotter, model=model, model_name=model_name, **pc_kwargs
-            )
-            for model, model_name in zip(pc_models, pc_model_names)
-        ]
-    else:
-        pc_actors = None
-
-    # Generate actors for mesh models
-    mesh_kwargs = dict(opacity=0.6, model_style="surface")
-    if not (mesh_models is None):
-        mesh_actors = [
-            add_single_model(
-                plotter=plotter, model=model, model_name=model_name, **mesh_kwargs
-            )
-            for model, model_name in zip(mesh_models, mesh_model_names)
-        ]
-    else:
-        mesh_actors = None
+    # Defer rendering until all actors have been added. Actors are added serially since
+    # the plotter's renderer and its OpenGL context are not thread-safe.
+    suppress_rendering = plotter.suppress_rendering
+    plotter.suppress_rendering = True
+
+    try:
+        # Generate actors for pc models
+        pc_kwargs = dict(model_style="points", model_size=8)
+        if not (pc_models is None):
+            pc_actors = [
+                add_single_model(
+                    plotter=plotter, model=model, model_name=model_name, **pc_kwargs
+                )
+                for model, model_name in zip(pc_models, pc_model_names)
+            ]
+        else:
+            pc_actors = None
+
+        # Generate actors for mesh models
+        mesh_kwargs = dict(opacity=0.6, model_style="surface")
+        if not (mesh_models is None):
+            mesh_actors = [
+                add_single_model(
+                    plotter=plotter, model=model, model_name=model_name, **mesh_kwargs
+                )
+                for model, model_name in zip(mesh_models, mesh_model_names)
+            ]
+        else:
+            mesh_actors = None
+    finally:
+        plotter.suppress_rendering = suppress_rendering
+        plotter.render()
     return pc_actors, mesh_actors
 
 
 def standard_tree(actors: list, base_id: int = 0):
-    actor_tree, actor_names = [], []
-    for i, actor in enumerate(actors):
-        if i == 0:
-            actor.SetVisibility(True)
-        else:
-            actor.SetVisibility(False)
-        actor_names.append(str(actor.name))
-        actor_tree.append(
-            {
-                "id": str(base_id + 1 + i),
-                "parent": str(0) if i == 0 else str(base_id + 1),
-                "visible": True if i == 0 else False,
-                "name": str(actor.name),
-            }
-        )
-
+    n_actors = len(actors)
+    actor_names = [str(actor.name) for actor in actors]
+    parents = [str(0)] + [str(base_id + 1)] * (n_actors - 1)
+    visibles = [True] + [False] * (n_actors - 1)
+    for actor, visible in zip(actors, visibles):
+        actor.SetVisibility(visible)
+
+    actor_tree = [
+        {
+            "id": str(base_id + 1 + i),
+            "parent": parent,
+            "visible": visible,
+            "name": name,
+        }
+        for i, (parent, visible, name) in enumerate(zip(parents, visibles, actor_names))
+    ]
     return actors, actor_names, actor_tree
 
 
@@ -72,22 +81,15 @@ def generate_actors_tree(
     pc_actors: Optional[list] = None,
     mesh_actors: Optional[list] = None,
 ):
-    if not (pc_actors is None):
-        pc_actors, pc_actor_names, pc_tree = standard_tree(actors=pc_actors, base_id=0)
-    else:
-        pc_actors, pc_actor_names, pc_tree = [], [], []
-
-    if not (mesh_actors is None):
-        mesh_actors, mesh_actor_names, mesh_tree = standard_tree(
-            actors=mesh_actors,
-            base_id=0 if pc_actors is None else len(pc_actors),
-        )
-    else:
-        mesh_actors, mesh_actor_names, mesh_tree = [], [], []
-
-    actors = pc_actors + mesh_actors
-    actor_names = pc_actor_names + mesh_actor_names
-    actor_tree = pc_tree + mesh_tree
+    groups, base_id = [], 0
+    for group_actors in [pc_actors, mesh_actors]:
+        if not (group_actors is None):
+            groups.append(standard_tree(actors=group_actors, base_id=base_id))
+            base_id += len(group_actors)
+
+    actors = list(chain.from_iterable(group[0] for group in groups))
+    actor_names = list(chain.from_iterable(group[1] for group in groups))
+    actor_tree = list(chain.from_iterable(group[2] for group in groups))
     return actors, actor_names, actor_tree
 
 
@@ -115,8 +117,7 @@ def init_actors(plotter, path):
         mesh_actors=mesh_actors,
     )
 
-    anndata_dir = os.path.join(path, "h5ad")
-    anndata_path = os.path.join(anndata_dir, os.listdir(path=anndata_dir)[0])
+    anndata_path = anndata_file(path=path)
     anndata_metrices = ["X"] + [i for i in adata.layers.keys()]
     return (
         anndata_path,
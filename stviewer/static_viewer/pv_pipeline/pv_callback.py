@@ -1,4 +1,3 @@
-import os
 import tempfile
 from pathlib import Path
 
@@ -10,7 +9,11 @@ import pyvista as pv
 from trame.app.file_upload import ClientFile
 
 from stviewer.assets import local_dataset_manager
-from stviewer.assets.dataset_acquisition import abstract_anndata, sample_dataset
+from stviewer.assets.dataset_acquisition import (
+    abstract_anndata,
+    anndata_file,
+    sample_dataset,
+)
 
 from .pv_actors import generate_actors, generate_actors_tree
 
@@ -216,10 +219,7 @@ class SwitchModels:
             )
 
             self._state["init_dataset"] = False
-            self._state["anndata_path"] = os.path.join(
-                os.path.join(path, "h5ad"),
-                os.listdir(path=os.path.join(path, "h5ad"))[0],
-            )
+            self._state["anndata_path"] = anndata_file(path=path)
             self._state["init_dataset"] = False
             self._state["active_id"] = 1
             self._state["actor_ids"] = actor_names
@@ -2,9 +2,16 @@ from typing import Optional
 
 import numpy as np
 from anndata import AnnData
-from dynamo.vectorfield import SvcVectorField
 from pyvista import PolyData
-from scipy.integrate import odeint
+
+
+def _obs_positions(obs_index, labels) -> np.ndarray:
+    """Return the integer positions of ``labels`` in ``obs_index``, raising if any label is missing."""
+    positions = obs_index.get_indexer(labels)
+    if (positions < 0).any():
+        missing = np.asarray(labels)[positions < 0]
+        raise KeyError(f"{missing[:5].tolist()} not found in `adata.obs.index`.")
+    return positions
 
 
 def morphogenesis(
@@ -16,6 +23,22 @@ def morphogenesis(
     morphopath_t_end: int = 10000,
     morphopath_sampling: int = 500,
 ):
+    """
+    Calculate the morphogenesis vector field, trajectories and animation stages of the source model.
+
+    Args:
+        source_adata: AnnData object of the source model.
+        target_adata: AnnData object that the source cells are mapped to.
+        source_pc_model: The source point cloud model.
+        mapping_factor: Alpha of the 3D mapping between the source and target cells.
+        morphofield_factor: Scale factor of the vector field arrows.
+        morphopath_t_end: Length of the integrated trajectories. Animation stages past ``morphopath_t_end`` (or past
+                          the steady state of a trajectory) hold the last position of that trajectory.
+        morphopath_sampling: Number of trajectories sampled for the trajectory model.
+
+    Returns:
+        The source point cloud model, the vector field model, the trajectory model and the animation stages.
+    """
     try:
         import spateo as st
     except ImportError:
@@ -24,7 +47,7 @@ def morphogenesis(
         )
 
     # Preprocess
-    _obs_index = source_pc_model.point_data["obs_index"]
+    _obs_index = np.asarray(source_pc_model.point_data["obs_index"])
     source_adata = source_adata[_obs_index, :]
 
     # 3D mapping
@@ -61,7 +84,7 @@ def morphogenesis(
         n_sampling=None,
         factor=morphofield_factor,
         key_added="obs_index",
-        label=source_pc_model.point_data["obs_index"],
+        label=_obs_index,
     )
 
     # trajectory
@@ -96,53 +119,38 @@ def morphogenesis(
         adata=source_adata, vf_key="VecFld_morpho", key_added="torsion"
     )
 
-    source_pc_index = source_pc_model.point_data["obs_index"]
-    source_pc_model.point_data["acceleration"] = np.asarray(
-        source_adata[np.asarray(source_pc_index)].obs["acceleration"]
-    )
-    source_pc_model.point_data["curvature"] = np.asarray(
-        source_adata[np.asarray(source_pc_index)].obs["curvature"]
-    )
-    source_pc_model.point_data["curl"] = np.asarray(
-        source_adata[np.asarray(source_pc_index)].obs["curl"]
-    )
-    source_pc_model.point_data["torsion"] = np.asarray(
-        source_adata[np.asarray(source_pc_index)].obs["torsion"]
-    )
+    obs_keys = {
+        "V_Z": "V_z",
+        "acceleration": "acceleration",
+        "curvature": "curvature",
+        "curl": "curl",
+        "torsion": "torsion",
+    }
+    for obs_key in obs_keys.values():
+        source_adata.obs[obs_key] = source_adata.obs[obs_key].astype(
+            np.float32, copy=False
+        )
 
-    pc_vectors_index = pc_vectors.point_data["obs_index"]
-    pc_vectors.point_data["V_Z"] = np.asarray(
-        source_adata[np.asarray(pc_vectors_index)].obs["V_z"]
-    )
-    pc_vectors.point_data["acceleration"] = np.asarray(
-        source_adata[np.asarray(pc_vectors_index)].obs["acceleration"]
-    )
-    pc_vectors.point_data["curvature"] = np.asarray(
-        source_adata[np.asarray(pc_vectors_index)].obs["curvature"]
-    )
-    pc_vectors.point_data["curl"] = np.asarray(
-        source_adata[np.asarray(pc_vectors_index)].obs["curl"]
-    )
-    pc_vectors.point_data["torsion"] = np.asarray(
-        source_adata[np.asarray(pc_vectors_index)].obs["torsion"]
-    )
+    obs_df = source_adata.obs
+    obs_fields = {
+        key: obs_df[obs_key].to_numpy(copy=False) for key, obs_key in obs_keys.items()
+    }
 
-    trajectory_index = trajectory_model.point_data["obs_index"]
-    trajectory_model.point_data["V_Z"] = np.asarray(
-        source_adata[np.asarray(trajectory_index)].obs["V_z"]
-    )
-    trajectory_model.point_data["acceleration"] = np.asarray(
-        source_adata[np.asarray(trajectory_index)].obs["acceleration"]
-    )
-    trajectory_model.point_data["curvature"] = np.asarray(
-        source_adata[np.asarray(trajectory_index)].obs["curvature"]
-    )
-    trajectory_model.point_data["curl"] = np.asarray(
-        source_adata[np.asarray(trajectory_index)].obs["curl"]
+    source_pc_pos = _obs_positions(obs_df.index, _obs_index)
+    for key in ["acceleration", "curvature", "curl", "torsion"]:
+        source_pc_model.point_data[key] = obs_fields[key][source_pc_pos]
+
+    pc_vectors_pos = _obs_positions(
+        obs_df.index, np.asarray(pc_vectors.point_data["obs_index"])
     )
-    trajectory_model.point_data["torsion"] = np.asarray(
-        source_adata[np.asarray(trajectory_index)].obs["torsion"]
+    for key, values in obs_fields.items():
+        pc_vectors.point_data[key] = values[pc_vectors_pos]
+
+    trajectory_pos = _obs_positions(
+        obs_df.index, np.asarray(trajectory_model.point_data["obs_index"])
     )
+    for key, values in obs_fields.items():
+        trajectory_model.point_data[key] = values[trajectory_pos]
 
     # cell stages of animation
     t_ind = np.asarray(list(source_adata.uns["fate_morpho"]["t"].keys()), dtype=int)
@@ -150,18 +158,39 @@ def morphogenesis(
     t = np.asarray(list(source_adata.uns["fate_morpho"]["t"].values()))[t_sort_ind]
     flats = np.unique([int(item) for sublist in t for item in sublist])
     flats = np.hstack((0, flats))
-    flats = np.sort(flats) if 3000 is None else np.sort(flats[flats <= 3000])
+    # Upper bound of the step between two animation stages
+    max_stage_step = 3000
+    flats = np.sort(flats[flats <= max_stage_step])
     time_vec = np.logspace(0, np.log10(max(flats) + 1), 100) - 1
-    vf = SvcVectorField()
-    vf.from_adata(source_adata, basis="morpho")
-    f = lambda x, _: vf.func(x)
-    displace = lambda x, dt: odeint(f, x, [0, dt])
-
-    init_states = source_adata.uns["fate_morpho"]["init_states"]
-    pts = [i.tolist() for i in init_states]
-    stages_X = [source_adata.obs.index.tolist()]
-    for i in range(100):
-        pts = [displace(cur_pts, time_vec[i])[1].tolist() for cur_pts in pts]
-        stages_X.append(pts)
+
+    # Each animation step displaces the previous positions by `time_vec[i]`, i.e. the
+    # stages are the trajectories at the cumulative times. Rather than integrating the
+    # field again, they are approximated by linear interpolation between the samples of
+    # the `morphopath` trajectories. Stages past the end of a trajectory (`t_end` or its
+    # steady state) hold its last position.
+    t_eval = np.cumsum(time_vec)
+    prediction = source_adata.uns["fate_morpho"]["prediction"]
+    if isinstance(prediction, dict):
+        prediction = [prediction[k] for k in sorted(prediction.keys(), key=int)]
+    fate_t = source_adata.uns["fate_morpho"]["t"]
+    t_raw = [fate_t[k] for k in sorted(fate_t.keys(), key=int)]
+    n_dims = np.asarray(source_adata.uns["fate_morpho"]["init_states"]).shape[1]
+    stages = np.empty((len(t_eval), len(prediction), n_dims), dtype=np.float32)
+    for j, (cur_t, cur_pred) in enumerate(zip(t_raw, prediction)):
+        cur_t, cur_pred = np.asarray(cur_t).flatten(), np.asarray(cur_pred)
+        if cur_pred.shape != (len(cur_t), n_dims):
+            if cur_pred.shape == (n_dims, len(cur_t)):
+                cur_pred = cur_pred.T
+            else:
+                raise ValueError(
+                    f"The prediction of trajectory {j} has shape {cur_pred.shape}, "
+                    f"which does not match {len(cur_t)} time points and {n_dims} dimensions."
+                )
+        cur_t_eval = np.minimum(t_eval, cur_t[-1])
+        for d in range(n_dims):
+            stages[:, j, d] = np.interp(cur_t_eval, cur_t, cur_pred[:, d])
+
+    # The state is sent to the client as JSON, so convert to lists only once here.
+    stages_X = [source_adata.obs.index.tolist()] + stages.tolist()
 
     return source_pc_model, pc_vectors, trajectory_model, stages_X